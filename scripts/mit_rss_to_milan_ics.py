@@ -15,36 +15,56 @@ How it decides "may affect Milan":
    because national actions often impact Milan even if not explicitly mentioned.
 
 Environment variables (optional):
-  RSS_URL            : RSS URL (default: MIT RSS)
+  RSS_URL            : comma-separated RSS URL(s), fetched concurrently (default: MIT RSS)
   OUTPUT_PATH        : output file path (default: docs/milan-strikes.ics)
   GEO_KEYWORDS       : comma-separated geo keywords (default covers Milan + Lombardy)
   INCLUDE_NATIONAL   : "1" to include national strikes (default: 1)
   NATIONAL_MODES     : comma-separated mode keywords (default: local transport, rail, air, highways)
 
 Dependencies:
-  pip install feedparser icalendar
+  none beyond the standard library (the MIT feed is plain RSS 2.0, read with ElementTree)
+  pip install pyahocorasick   (optional: C Aho-Corasick keyword scanner)
+
+The module is fully annotated (mypy --strict clean), so it can also be compiled with mypyc
+(run from the repo root; the native module is built next to the working directory):
+  mypyc scripts/mit_rss_to_milan_ics.py && python -c "import mit_rss_to_milan_ics as m; m.main()"
 """
 from __future__ import annotations
 
+import email.utils
+import functools
+import html
+import io
 import os
 import re
 import urllib.request
+from http.client import HTTPResponse
 import hashlib
-from datetime import date, timedelta
-from typing import Iterable, Optional, Tuple
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta, timezone
+from typing import IO, Any, Callable, Iterable, Iterator, Optional, Sequence, Tuple, TypeVar
 
-import feedparser
-from icalendar import Calendar, Event
+try:
+    import ahocorasick  # type: ignore[import-not-found]  # optional C extension (pyahocorasick)
+except ImportError:
+    ahocorasick = None
 
 DEFAULT_RSS_URL = "https://scioperi.mit.gov.it/mit2/public/scioperi/rss"
 DEFAULT_OUTPUT_PATH = "docs/milan-strikes.ics"
+FETCH_WORKERS = 4
+
+T = TypeVar("T")
+
+# (title, summary, link, published date) of one RSS <item>
+Item = Tuple[str, str, str, Optional[date]]
 
-DEFAULT_GEO_KEYWORDS = [
+DEFAULT_GEO_KEYWORDS = (
     "MILANO", "MILAN", "MI", "LOMBARDIA", "LOMBARDY", "MONZA", "BRIANZA",
     "LINATE", "MALPENSA", "BERGAMO", "ORIO AL SERIO", "VARESE", "COMO", "PAVIA", "CREMONA", "MANTOVA", "LECCO", "SONDRIO", "BRESCIA"
-]
+)
 
-DEFAULT_NATIONAL_MODE_KEYWORDS = [
+DEFAULT_NATIONAL_MODE_KEYWORDS = (
     # local public transport
     "TRASPORTO PUBBLICO LOCALE", "TPL", "AUTOBUS", "BUS", "METRO", "METROPOLITANA", "TRAM",
     # rail
@@ -53,199 +73,446 @@ DEFAULT_NATIONAL_MODE_KEYWORDS = [
     "AEREO", "AEROPORT", "ENAV", "HANDLING",
     # highways / roads
     "AUTOSTRAD", "TAXI"
+)
+
+# Keyword matching runs on lowercased text, so keep lowercased copies of the defaults.
+_GEO_KW_LOWER = tuple(k.lower() for k in DEFAULT_GEO_KEYWORDS)
+_NAT_MODE_KW_LOWER = tuple(k.lower() for k in DEFAULT_NATIONAL_MODE_KEYWORDS)
+
+# (English, Chinese) labels; detection returns these shared objects, never new ones.
+TPL_MODE = ("Local public transport strike", "城市公共交通罢工")
+RAIL_MODE = ("Rail strike", "铁路罢工")
+AIR_MODE = ("Air transport strike", "航空相关罢工")
+ROAD_MODE = ("Road transport strike", "公路交通相关罢工")
+DEFAULT_MODE = ("Transport strike", "交通罢工")
+
+SCOPE_NATIONAL = ("National", "全国")
+SCOPE_REGIONAL = ("Regional", "区域")
+SCOPE_PROVINCE = ("Province", "省级")
+SCOPE_LOCAL = ("Local", "本地")
+DEFAULT_SCOPE = ("Unspecified", "未注明")
+
+# Mode buckets for classify(), in priority order (lower id wins).
+MODES: list[Tuple[Tuple[str, str], list[str]]] = [
+    (TPL_MODE, ["trasporto pubblico locale", "tpl", "bus", "autobus", "metro", "metropolitana", "tram"]),
+    (RAIL_MODE, ["ferrovi", "treni", "trenitalia", "trenord", "rfi", "italo"]),
+    (AIR_MODE, ["aereo", "aeroport", "enav", "handling"]),
+    (ROAD_MODE, ["autostrad", "taxi"]),
 ]
 
-DATE_PATTERNS = [
-    re.compile(r'(?P<d>\d{1,2})[\/\-](?P<m>\d{1,2})[\/\-](?P<y>\d{4})'),  # dd/mm/yyyy
-    re.compile(r'(?P<y>\d{4})[\/\-](?P<m>\d{1,2})[\/\-](?P<d>\d{1,2})'),  # yyyy-mm-dd
+# Scope buckets for classify(), same priority rule.
+SCOPES: list[Tuple[Tuple[str, str], list[str]]] = [
+    (SCOPE_NATIONAL, ["nazionale"]),
+    (SCOPE_REGIONAL, ["regionale"]),
+    (SCOPE_PROVINCE, ["provinc"]),
+    (SCOPE_LOCAL, ["locale"]),
 ]
 
-def _env_list(name: str, default: list[str]) -> list[str]:
+# Event description; only the type/scope lines vary per event.
+DESC_TEMPLATE = (
+    "EN:\n"
+    "• Type: {mode_en}\n"
+    "• Scope: {scope_en}\n"
+    "• This item was included by a high-recall filter (Milan/Lombardy keywords and/or national transport action).\n"
+    "• Always verify details close to the date via official notices.\n"
+    "\n"
+    "中文：\n"
+    "• 类型：{mode_zh}\n"
+    "• 范围：{scope_zh}\n"
+    "• 该条目由“高召回”过滤规则纳入（出现米兰/伦巴第关键词，或属于全国性交通行动）。\n"
+    "• 请在临近日期以官方通知为准。"
+)
+DESC_LINK_HEADER = "\n\nSource link / 来源链接：\n"
+
+# 常见取消/撤销/延期关键词（出现就不应当进日历）
+CANCEL_KEYWORDS = ("revoc", "annull", "sospes", "differit", "rinviat", "cancell")
+
+# dd/mm/yyyy or yyyy-mm-dd, matched in a single pass
+DATE_RE = re.compile(
+    r'(?:(?P<d1>\d{1,2})[\/\-](?P<m1>\d{1,2})[\/\-](?P<y1>\d{4}))'
+    r'|(?:(?P<y2>\d{4})[\/\-](?P<m2>\d{1,2})[\/\-](?P<d2>\d{1,2}))'
+)
+
+@functools.lru_cache(maxsize=None)
+def _env_list(name: str, default: Tuple[str, ...]) -> Tuple[str, ...]:
     raw = os.getenv(name, "").strip()
     if raw:
-        return [x.strip() for x in raw.split(",") if x.strip()]
+        return tuple(x.strip() for x in raw.split(",") if x.strip())
     return default
 
-def _rss_url() -> str:
-    return os.getenv("RSS_URL", DEFAULT_RSS_URL)
+@functools.lru_cache(maxsize=None)
+def _env_keywords(name: str, default_lower: Tuple[str, ...]) -> Tuple[str, ...]:
+    kws = _env_list(name, ())
+    return tuple(k.lower() for k in kws) if kws else default_lower
+
+def _rss_urls() -> Tuple[str, ...]:
+    return _env_list("RSS_URL", (DEFAULT_RSS_URL,))
+
+def _open_rss(url: str) -> HTTPResponse:
+    req = urllib.request.Request(
+        url,
+        headers={"User-Agent": "Mozilla/5.0 (GitHub Actions)"},
+    )
+    resp: HTTPResponse = urllib.request.urlopen(req, timeout=30)
+    return resp
+
+def _pub_date(value: str) -> Optional[date]:
+    # RFC 822 pubDate -> calendar date in UTC
+    try:
+        dt = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return dt.date()
+
+def _item_fields(el: ET.Element) -> Item:
+    return (
+        (el.findtext("title") or "").strip(),
+        (el.findtext("description") or "").strip(),
+        (el.findtext("link") or "").strip(),
+        _pub_date(el.findtext("pubDate") or ""),
+    )
+
+def iter_rss_items(stream: IO[bytes]) -> Iterator[Item]:
+    # RSS 2.0 only: walk <item> elements as they complete and drop each one after use.
+    for _, el in ET.iterparse(stream, events=("end",)):
+        if el.tag.rsplit("}", 1)[-1] != "item":
+            continue
+        yield _item_fields(el)
+        el.clear()
+
+# '&' that does not start an XML entity or character reference; group 1 is an
+# HTML named entity (e.g. '&egrave;') when there is one.
+_BAD_AMP_RE = re.compile(r"&(?!(?:amp|lt|gt|quot|apos|#\d+|#x[0-9a-fA-F]+);)(?:([A-Za-z][A-Za-z0-9]*);)?")
+_CDATA_RE = re.compile(r"(<!\[CDATA\[.*?\]\]>)", re.DOTALL)
+_ITEM_RE = re.compile(r"<item\b.*?</item\s*>", re.DOTALL)
+
+def _fix_amp(m: re.Match[str]) -> str:
+    if m.group(1):
+        char = html.unescape(m.group(0))
+        if char != m.group(0):
+            return "".join(f"&#{ord(c)};" for c in char)
+    return "&amp;" + (f"{m.group(1)};" if m.group(1) else "")
+
+def _lenient_items(rss_url: str, body: bytes) -> list[Item]:
+    # Malformed feed: force UTF-8, turn HTML entities and bare '&' into valid XML,
+    # then parse each <item> on its own so one broken item cannot sink the rest.
+    # CDATA sections (odd parts of the split) are already valid and are left byte for byte.
+    parts = _CDATA_RE.split(body.decode("utf-8", errors="replace"))
+    text = "".join(p if i % 2 else _BAD_AMP_RE.sub(_fix_amp, p) for i, p in enumerate(parts))
+    try:
+        return list(iter_rss_items(io.BytesIO(text.encode("utf-8"))))
+    except ET.ParseError as e:
+        error = e
+    items: list[Item] = []
+    skipped = 0
+    for m in _ITEM_RE.finditer(text):
+        try:
+            items.append(_item_fields(ET.fromstring(m.group(0))))
+        except ET.ParseError:
+            skipped += 1
+    if not items:
+        raise RuntimeError(f"Failed to parse RSS feed {rss_url}: {error}") from error
+    if skipped:
+        print(f"WARN: skipped {skipped} malformed item(s) in {rss_url}: {error}")
+    return items
+
+def _fetch_rss(url: str) -> bytes:
+    with _open_rss(url) as resp:
+        return resp.read()
+
+def _parse_items(rss_url: str, body: bytes) -> list[Item]:
+    try:
+        return list(iter_rss_items(io.BytesIO(body)))
+    except ET.ParseError:
+        return _lenient_items(rss_url, body)
+
+def load_items(rss_urls: Tuple[str, ...]) -> list[Item]:
+    # Feeds are downloaded concurrently (each worker closes its own connection);
+    # parsing stays serial on this thread, in URL order, as each body arrives.
+    items: list[Item] = []
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as ex:
+        for url, body in zip(rss_urls, ex.map(_fetch_rss, rss_urls)):
+            items += _parse_items(url, body)
+    return items
 
 def _output_path() -> str:
     return os.getenv("OUTPUT_PATH", DEFAULT_OUTPUT_PATH)
 
+@functools.lru_cache(maxsize=None)
 def _include_national() -> bool:
     return os.getenv("INCLUDE_NATIONAL", "1").strip() not in ("0", "false", "False", "no", "NO")
 
-def matches_any(text: str, keywords: Iterable[str]) -> bool:
-    t = (text or "").lower()
-    for k in keywords:
-        if k.lower() in t:
-            return True
-    return False
-
-def is_cancelled(text: str) -> bool:
-    t = (text or "").lower()
-    # 常见取消/撤销/延期关键词（出现就不应当进日历）
-    return any(k in t for k in ["revoc", "annull", "sospes", "differit", "rinviat", "cancell"])
-
-def extract_dates(text: str) -> list[date]:
-    found: list[date] = []
-    for pat in DATE_PATTERNS:
-        for m in pat.finditer(text or ""):
-            y = int(m.group("y"))
-            mo = int(m.group("m"))
-            d = int(m.group("d"))
-            try:
-                found.append(date(y, mo, d))
-            except ValueError:
-                pass
-    return sorted({d for d in found})
-
-def choose_event_span(dates: list[date]) -> Optional[Tuple[date, date]]:
+# A compiled scanner takes lowercased text and returns a bitmask with bit i set
+# when bucket i has a keyword in the text.
+Scanner = Callable[[str], int]
+
+def _codegen_scanner(buckets: list[list[str]]) -> Scanner:
+    # Straight-line `'kw' in t or ...` tests per bucket, compiled once: each test is a
+    # C-level substring search, with no Python loop over the keyword list.
+    lines = ["def hits(t):", "    h = 0"]
+    for i, kws in enumerate(buckets):
+        if kws:
+            lines.append(f"    if {' or '.join(f'{k!r} in t' for k in kws)}:")
+            lines.append(f"        h |= {1 << i}")
+    lines.append("    return h")
+    ns: dict[str, Any] = {}
+    exec(compile("\n".join(lines), "<keyword-scanner>", "exec"), ns)
+    hits: Scanner = ns["hits"]
+    return hits
+
+def _ahocorasick_scanner(buckets: list[list[str]]) -> Scanner:
+    bits: dict[str, int] = {}
+    for i, kws in enumerate(buckets):
+        for k in kws:
+            bits[k] = bits.get(k, 0) | (1 << i)
+    if not bits:
+        return lambda t: 0  # pyahocorasick refuses to scan with an empty automaton
+    ac = ahocorasick.Automaton()
+    for k, bit in bits.items():
+        ac.add_word(k, bit)
+    ac.make_automaton()
+    every = (1 << len(buckets)) - 1
+
+    def hits(t: str) -> int:
+        h = 0
+        for _, bit in ac.iter(t):
+            h |= bit
+            if h == every:  # nothing left to find (a single bucket stops at its first hit)
+                break
+        return h
+
+    return hits
+
+def compile_keywords(buckets: Iterable[Iterable[str]]) -> Scanner:
+    # Keywords must already be lowercase; callers scan lowercased text.
+    non_empty = [[k for k in kws if k] for kws in buckets]
+    if ahocorasick is None:
+        return _codegen_scanner(non_empty)
+    return _ahocorasick_scanner(non_empty)
+
+@functools.lru_cache(maxsize=None)
+def build_matcher(keywords: Tuple[str, ...]) -> Scanner:
+    return compile_keywords([keywords])
+
+# Mode and scope keywords share one scan: mode buckets take the low bits, scope buckets
+# the bits above them. Each half of the mask maps to its answer through a precomputed table.
+CATEGORY_HITS = compile_keywords([kws for _, kws in MODES] + [kws for _, kws in SCOPES])
+_MODE_MASK = (1 << len(MODES)) - 1
+
+def _first_bucket_table(buckets: Sequence[Tuple[T, Sequence[str]]], default: T) -> list[T]:
+    # table[mask] -> value of the lowest set bit's bucket (the highest-priority hit)
+    return [
+        next((buckets[i][0] for i in range(len(buckets)) if mask >> i & 1), default)
+        for mask in range(1 << len(buckets))
+    ]
+
+_MODE_BY_HITS = _first_bucket_table(MODES, DEFAULT_MODE)
+_SCOPE_BY_HITS = _first_bucket_table(SCOPES, DEFAULT_SCOPE)
+
+def matches_any(text_l: str, matcher: Scanner) -> bool:
+    return matcher(text_l) != 0
+
+def is_cancelled(text_l: str) -> bool:
+    return any(k in text_l for k in CANCEL_KEYWORDS)
+
+# Dates are handled as yyyymmdd ints (ordering matches calendar order) and only
+# turned into date objects for the one day that ends up in the event.
+_MONTH_DAYS = (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+def _ymd(y: int, m: int, d: int) -> Optional[int]:
+    if y < 1 or not 1 <= m <= 12 or not 1 <= d <= _MONTH_DAYS[m]:
+        return None
+    if m == 2 and d == 29 and not (y % 4 == 0 and (y % 100 != 0 or y % 400 == 0)):
+        return None
+    return y * 10000 + m * 100 + d
+
+def date_to_ymd(d: date) -> int:
+    return d.year * 10000 + d.month * 100 + d.day
+
+def ymd_to_date(n: int) -> date:
+    y, md = divmod(n, 10000)
+    m, d = divmod(md, 100)
+    return date(y, m, d)
+
+def extract_dates(text: str) -> list[int]:
+    found: set[int] = set()
+    for m in DATE_RE.finditer(text or ""):
+        if m.group("y1"):
+            y, mo, d = m.group("y1", "m1", "d1")
+        else:
+            y, mo, d = m.group("y2", "m2", "d2")
+        n = _ymd(int(y), int(mo), int(d))
+        if n is not None:
+            found.add(n)
+    return sorted(found)
+
+def choose_event_span(dates: list[int]) -> Optional[Tuple[date, date]]:
     if not dates:
         return None
-    start = min(dates)
-    end = max(dates) + timedelta(days=1)  # all-day DTEND is exclusive
+    start = ymd_to_date(min(dates))
+    end = ymd_to_date(max(dates)) + timedelta(days=1)  # all-day DTEND is exclusive
     return (start, end)
 
 def make_uid(link: str, title: str) -> str:
-    h = hashlib.sha1(f"{link}|{title}".encode("utf-8")).hexdigest()
-    return f"mit-strike-{h}@milan"
-
-def detect_scope(text: str) -> str:
-    t = (text or "").lower()
-    if "nazionale" in t:
-        return "National / 全国"
-    if "regionale" in t:
-        return "Regional / 区域"
-    if "provinc" in t:
-        return "Province / 省级"
-    if "locale" in t:
-        return "Local / 本地"
-    return "Unspecified / 未注明"
-
-def detect_mode(text: str) -> Tuple[str, str]:
-    t = (text or "").lower()
-    # Local public transport
-    if any(x in t for x in ["trasporto pubblico locale", "tpl", "bus", "autobus", "metro", "metropolitana", "tram"]):
-        return ("Local public transport strike", "城市公共交通罢工")
-    # Rail
-    if any(x in t for x in ["ferrovi", "treni", "trenitalia", "trenord", "rfi", "italo"]):
-        return ("Rail strike", "铁路罢工")
-    # Air
-    if any(x in t for x in ["aereo", "aeroport", "enav", "handling"]):
-        return ("Air transport strike", "航空相关罢工")
-    # Highways / taxi
-    if any(x in t for x in ["autostrad", "taxi"]):
-        return ("Road transport strike", "公路交通相关罢工")
-    return ("Transport strike", "交通罢工")
-
-def should_include(entry_blob: str, geo_kw: list[str], include_national: bool, nat_mode_kw: list[str]) -> bool:
-    if matches_any(entry_blob, geo_kw):
+    # stability hash only (not security): BLAKE2b is faster than SHA-1 on short inputs
+    h = hashlib.blake2b(digest_size=10)
+    h.update(link.encode("utf-8"))
+    h.update(b"|")
+    h.update(title.encode("utf-8"))
+    return f"mit-strike-{h.hexdigest()}@milan"
+
+def classify(text_l: str) -> Tuple[Tuple[str, str], Tuple[str, str]]:
+    # (mode, scope) labels from a single scan
+    h = CATEGORY_HITS(text_l)
+    return _MODE_BY_HITS[h & _MODE_MASK], _SCOPE_BY_HITS[h >> len(MODES)]
+
+def should_include(blob_l: str, geo_kw: Scanner, include_national: bool, nat_mode_kw: Scanner) -> bool:
+    if matches_any(blob_l, geo_kw):
         return True
     if include_national:
         # include national strikes of big modes
-        if "nazionale" in entry_blob.lower() and matches_any(entry_blob, nat_mode_kw):
+        if "nazionale" in blob_l and matches_any(blob_l, nat_mode_kw):
             return True
     return False
 
-def main() -> None:
-    rss_url = _rss_url()
-    out_path = _output_path()
-    geo_kw = _env_list("GEO_KEYWORDS", DEFAULT_GEO_KEYWORDS)
-    nat_mode_kw = _env_list("NATIONAL_MODES", DEFAULT_NATIONAL_MODE_KEYWORDS)
-    include_national = _include_national()
+def iter_events(
+    items: Iterable[Item], geo_kw: Scanner, include_national: bool, nat_mode_kw: Scanner
+) -> Iterator[str]:
+    seen: set[str] = set()  # rendered VEVENTs: only byte-identical events (e.g. from two feeds) collapse
+    today = date_to_ymd(date.today())
+    for title, summary, link, published in items:
+        blob_l = f"{title}\n{summary}\n{link}".lower()  # every predicate below scans this
 
-
-    req = urllib.request.Request(
-        rss_url,
-        headers={"User-Agent": "Mozilla/5.0 (GitHub Actions)"},
-    )
-    raw = urllib.request.urlopen(req, timeout=30).read()
-
-    # parse from raw bytes first (avoid broken text decoding)
-    feed = feedparser.parse(raw)
-
-    # If bozo but still has entries, continue.
-    # Only fail when bozo AND no entries.
-    if getattr(feed, "bozo", False) and not getattr(feed, "entries", []):
-        # fallback: force UTF-8 decode then re-parse
-        text = raw.decode("utf-8", errors="replace")
-        feed = feedparser.parse(text.encode("utf-8"))
-
-    if getattr(feed, "bozo", False) and not getattr(feed, "entries", []):
-        raise RuntimeError(
-            f"Failed to parse RSS feed (no entries). bozo_exception={getattr(feed, 'bozo_exception', 'unknown')}"
-        )
-       
-    cal = Calendar()
-    cal.add("prodid", "-//Milan Strike Feed (EN+ZH)//EN")
-    cal.add("version", "2.0")
-    cal.add("calscale", "GREGORIAN")
-    cal.add("x-wr-calname", "Milan transport strikes (may affect) / 可能影响米兰的交通罢工")
-    cal.add("x-wr-caldesc", "Auto-generated from MIT transport strikes RSS. High-recall filter for Milan area + national modes. Verify near the date.")
-
-    kept = 0
-    for entry in getattr(feed, "entries", []):
-        title = getattr(entry, "title", "") or ""
-        summary = getattr(entry, "summary", "") or getattr(entry, "description", "") or ""
-        link = getattr(entry, "link", "") or ""
-
-        blob = f"{title}\n{summary}\n{link}"
-        if is_cancelled(blob):
+        # Filter before anything else: most entries are dropped here.
+        if not should_include(blob_l, geo_kw, include_national, nat_mode_kw):
             continue
 
-        if not should_include(blob, geo_kw, include_national, nat_mode_kw):
+        if is_cancelled(blob_l):
             continue
 
-        dates = extract_dates(blob)
-        if not dates:
-            pp = getattr(entry, "published_parsed", None) or getattr(entry, "updated_parsed", None)
-            if pp:
-                dates = [date(pp.tm_year, pp.tm_mon, pp.tm_mday)]
+        uid = make_uid(link, title)
+
+        dates = extract_dates(blob_l)  # sorted
+        if not dates and published:
+            dates = [date_to_ymd(published)]
         if not dates:
             continue
 
-        today = date.today()
-        future = sorted([d for d in dates if d >= today])
-        dtstart = future[0] if future else sorted(dates)[0]
+        dtstart = ymd_to_date(next((d for d in dates if d >= today), dates[0]))
         dtend = dtstart + timedelta(days=1)  # 永远只占一天
 
-        mode_en, mode_zh = detect_mode(blob)
-        scope = detect_scope(blob)
-
-        ev = Event()
-        ev.add("uid", make_uid(link, title))
-        ev.add("dtstart", dtstart)  # all-day
-        ev.add("dtend", dtend)
-        ev.add("summary", f"{mode_en} (may affect Milan) / {mode_zh}（可能影响米兰）")
-
-        desc_lines = [
-            "EN:",
-            f"• Type: {mode_en}",
-            f"• Scope: {scope.split('/')[0].strip()}",
-            "• This item was included by a high-recall filter (Milan/Lombardy keywords and/or national transport action).",
-            "• Always verify details close to the date via official notices.",
-            "",
-            "中文：",
-            f"• 类型：{mode_zh}",
-            f"• 范围：{scope.split('/')[1].strip() if '/' in scope else '未注明'}",
-            "• 该条目由“高召回”过滤规则纳入（出现米兰/伦巴第关键词，或属于全国性交通行动）。",
-            "• 请在临近日期以官方通知为准。",
-        ]
+        (mode_en, mode_zh), (scope_en, scope_zh) = classify(blob_l)
+
+        ev_summary = f"{mode_en} (may affect Milan) / {mode_zh}（可能影响米兰）"
+        description = DESC_TEMPLATE.format(
+            mode_en=mode_en,
+            mode_zh=mode_zh,
+            scope_en=scope_en,
+            scope_zh=scope_zh,
+        )
         if link:
-            desc_lines += ["", "Source link / 来源链接：", link]
-            ev.add("url", link)
+            description += DESC_LINK_HEADER + link
+
+        vevent = format_vevent(
+            uid, dtstart, dtend, ev_summary, description, link, f"Strike,Transport,{mode_en}"
+        )
+        if vevent in seen:
+            continue
+        seen.add(vevent)
+        yield vevent
+
+def ics_escape(text: str) -> str:
+    # RFC 5545 TEXT value escaping
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+        .replace("\r", "\\n")
+    )
 
-        ev.add("description", "\n".join(desc_lines))
-        ev.add("categories", f"Strike,Transport,{mode_en}")
-        cal.add_component(ev)
-        kept += 1
+def ics_fold(line: str, limit: int = 75) -> str:
+    # RFC 5545 folding: the first line carries fewer than `limit` octets, each continuation
+    # line is a space plus fewer than `limit` octets (so at most `limit` in total), and
+    # neither a UTF-8 sequence nor a backslash escape is split.
+    if len(line) < limit and line.isascii():
+        return line
+    parts: list[str] = []
+    cur: list[str] = []
+    size = 0
+    for ch in line:
+        n = 1 if ch < "\x80" else len(ch.encode("utf-8"))
+        if cur and size + n >= limit:
+            carry = cur.pop() if len(cur) > 1 and cur[-1] == "\\" else ""
+            parts.append("".join(cur))
+            cur = [carry] if carry else []
+            size = len(carry)
+        cur.append(ch)
+        size += n
+    parts.append("".join(cur))
+    return "\r\n ".join(parts)
+
+def format_vevent(
+    uid: str, dtstart: date, dtend: date, summary: str, description: str, url: str, categories: str
+) -> str:
+    # All-day VEVENT, properties in the order icalendar used to emit them.
+    lines = [
+        "BEGIN:VEVENT",
+        f"SUMMARY:{ics_escape(summary)}",
+        f"DTSTART;VALUE=DATE:{dtstart:%Y%m%d}",
+        f"DTEND;VALUE=DATE:{dtend:%Y%m%d}",
+        f"UID:{ics_escape(uid)}",
+        f"CATEGORIES:{ics_escape(categories)}",
+        f"DESCRIPTION:{ics_escape(description)}",
+    ]
+    if url:
+        lines.append(f"URL:{url}")
+    lines.append("END:VEVENT")
+    return "".join(f"{ics_fold(line)}\r\n" for line in lines)
+
+ICS_HEADER = "".join(f"{ics_fold(line)}\r\n" for line in [
+    "BEGIN:VCALENDAR",
+    "VERSION:2.0",
+    "PRODID:-//Milan Strike Feed (EN+ZH)//EN",
+    "CALSCALE:GREGORIAN",
+    "X-WR-CALDESC:" + ics_escape("Auto-generated from MIT transport strikes RSS. High-recall filter for Milan area + national modes. Verify near the date."),
+    "X-WR-CALNAME:" + ics_escape("Milan transport strikes (may affect) / 可能影响米兰的交通罢工"),
+])
+ICS_FOOTER = "END:VCALENDAR\r\n"
+
+def write_calendar(out_path: str, events: Iterable[str]) -> int:
+    # Serialize events one by one straight into the file instead of building the whole
+    # calendar in memory; write to a temp file so a failed run never leaves a partial feed.
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    tmp_path = f"{out_path}.tmp"
+    kept = 0
+    try:
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            f.write(ICS_HEADER)
+            for ev in events:
+                f.write(ev)
+                kept += 1
+            f.write(ICS_FOOTER)
+        os.replace(tmp_path, out_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return kept
+
+def main() -> None:
+    rss_urls = _rss_urls()
+    out_path = _output_path()
+    geo_kw = build_matcher(_env_keywords("GEO_KEYWORDS", _GEO_KW_LOWER))
+    nat_mode_kw = build_matcher(_env_keywords("NATIONAL_MODES", _NAT_MODE_KW_LOWER))
+    include_national = _include_national()
 
-    os.makedirs(os.path.dirname(out_path), exist_ok=True)
-    with open(out_path, "wb") as f:
-        f.write(cal.to_ical())
+    events = iter_events(load_items(rss_urls), geo_kw, include_national, nat_mode_kw)
+    kept = write_calendar(out_path, events)
 
-    print(f"OK: wrote {out_path} with {kept} event(s). RSS={rss_url}")
+    print(f"OK: wrote {out_path} with {kept} event(s). RSS={','.join(rss_urls)}")
 
 if __name__ == "__main__":
     main()